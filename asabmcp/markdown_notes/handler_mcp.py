@@ -1,5 +1,10 @@
 import os
+import re
+import time
+import base64
+import asyncio
 import logging
+import collections
 
 import asab
 
@@ -13,7 +18,143 @@ NOTE_URI_PREFIX = "note://"
 PICTURE_URI_PREFIX="img://"
 NOTE_MIME_TYPE = "text/markdown"
 NOTE_EXTENSION = ".md"
-PICTURE_EXTENSIONS = {".jpg", ".png", ".gif"}
+PICTURE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif"}
+
+# str.endswith checks a tuple of suffixes in a single C-level call
+_PICTURE_EXT_TUPLE = tuple(PICTURE_EXTENSIONS)
+
+_MIME_BY_EXT = {
+	".png": "image/png",
+	".jpg": "image/jpeg",
+	".jpeg": "image/jpeg",
+	".gif": "image/gif",
+}
+
+# How long (in seconds) a cached resource listing stays valid
+# before the notes tree is re-walked.
+LIST_CACHE_TTL = 5.0
+
+# Maximum number of note contents memoized for resource reads.
+NOTE_CACHE_MAX_SIZE = 128
+
+# Large payloads are written to disk in chunks of this size.
+WRITE_CHUNK_SIZE = 1 << 20
+
+# Description prefix shared by every note resource link.
+_NOTE_DESC_PREFIX = "Markdown note: "
+
+# Matches '..' only as a whole path segment, so legitimate names
+# such as 'hello..world.md' pass.
+_SEG_TRAVERSAL = re.compile(r'(?:^|/)\.\.(?:/|$)')
+
+
+# The path parameter contract shared by the note tools;
+# kept as one module-level constant so the boilerplate is stored once.
+_PATH_PARAM_DOC = """The path parameter:
+- Can include subdirectories separated by '/' (e.g., "projects/meeting-notes")
+- The '.md' extension is automatically appended if not provided
+- Leading slashes are normalized
+- Paths containing '..' are not allowed for security reasons"""
+
+
+_DESC_CREATE_OR_UPDATE_NOTE = f"""Create a new Markdown note or update an existing Markdown note at the given path with the provided content.
+
+{_PATH_PARAM_DOC}
+- Subdirectories are automatically created if they don't exist
+
+The content parameter should contain valid Markdown text.
+
+Returns a resource link that can be used to reference the created or updated note."""
+
+
+_DESC_DELETE_NOTE = f"""Delete a Markdown note at the specified path.
+
+{_PATH_PARAM_DOC}
+
+Note: Only the note file is deleted. Empty subdirectories are left intact.
+If the note does not exist, an error will be raised.
+
+Returns a confirmation message indicating successful deletion."""
+
+
+_DESC_READ_NOTE = f"""Read and return the full content of a Markdown note at the specified path.
+
+{_PATH_PARAM_DOC}
+
+Returns the raw Markdown content of the note as a string.
+If the note does not exist, an error will be raised with a suggestion to use 'list_notes' to find available notes."""
+
+
+_DESC_LIST_NOTES = """List all Markdown notes (.md files) in the specified directory, optionally including directories.
+
+The directory parameter:
+- Use an empty string or '/' to list notes in the root notes directory
+- Can include subdirectories separated by '/' (e.g., "projects/2024")
+- Leading slashes are normalized
+- Paths containing '..' are not allowed for security reasons
+- Only lists direct children (does not recursively search subdirectories)
+- Hidden files (starting with '.') are excluded
+
+The directories parameter:
+- If True, the list will include directories, can be used to list directories recursively
+- If False, the list will only include notes
+- If not provided, the list will only include notes
+
+Returns:
+- A text summary listing all notes found in the directory
+- Resource links for each note that can be used with 'read_note' or other tools
+- The resource link URI or name field can be used as the path parameter in other operations
+
+If the directory is empty or doesn't exist, an appropriate message will be returned."""
+
+
+_DESC_UPLOAD_PICTURE = f"""Upload an image file to the notes directory.
+
+The path parameter:
+- Must include a filename with one of the supported extensions: {', '.join(sorted(PICTURE_EXTENSIONS))}
+- Can include subdirectories separated by '/' (e.g., "images/screenshots/example.png")
+- Subdirectories are automatically created if they don't exist
+- Leading slashes are normalized
+- Paths containing '..' are not allowed for security reasons
+
+The content parameter should contain the binary image data (base64-encoded when transmitted).
+
+Supported image formats: {', '.join(sorted(PICTURE_EXTENSIONS))}
+
+Returns a resource link that can be used to reference the uploaded image."""
+
+
+# Input schemas, shared by reference wherever the parameters match.
+_SCHEMA_PATH = {
+	"type": "object",
+	"properties": {
+		"path": {"type": "string"},
+	},
+}
+
+_SCHEMA_NOTE_WRITE = {
+	"type": "object",
+	"properties": {
+		"path": {"type": "string"},
+		"content": {"type": "string", "format": "markdown"},
+	},
+}
+
+_SCHEMA_PICTURE_UPLOAD = {
+	"type": "object",
+	"properties": {
+		"path": {"type": "string"},
+		"content": {"type": "string", "format": "binary"},
+	},
+}
+
+_SCHEMA_LIST_NOTES = {
+	"type": "object",
+	"properties": {
+		"directory": {"type": "string", "default": ""},
+		"directories": {"type": "boolean", "default": False},
+	},
+}
 
 
 class MarkdownNotesMCPHandler():
@@ -25,6 +166,32 @@ class MarkdownNotesMCPHandler():
 
 		os.makedirs(self.NotesDirectory, exist_ok=True)
 
+		# The notes directory is fixed at startup, so resolve it once
+		# (incl. symlinks) instead of paying an abspath per tool call;
+		# a relative path would also force the kernel to resolve against
+		# the process cwd on every subsequent open/stat/remove.
+		self.NotesDirectory = os.path.realpath(self.NotesDirectory)
+		self._NotesPrefix = self.NotesDirectory + os.sep
+
+		self._ListCache = None
+		self._ListCacheTs = 0.0
+		self._ListCacheMtime = 0.0
+
+		# Note content memoization keyed by absolute path,
+		# validated by (mtime, size) on every access.
+		self._NoteCache = {}
+
+		# Directories known to exist, so that the write path can skip
+		# the os.makedirs syscall on repeat writes into the same place.
+		self._KnownDirs = {self.NotesDirectory}
+		stack = collections.deque([self.NotesDirectory])
+		while stack:
+			with os.scandir(stack.pop()) as it:
+				for entry in it:
+					if entry.is_dir(follow_symlinks=False):
+						self._KnownDirs.add(entry.path)
+						stack.append(entry.path)
+
 		self.App.MCPService.add_tool(self.tool_create_or_update_note)
 		self.App.MCPService.add_tool(self.tool_delete_note)
 		self.App.MCPService.add_tool(self.tool_read_note)
@@ -37,50 +204,109 @@ class MarkdownNotesMCPHandler():
 		self.App.MCPService.add_resource_list(NOTE_URI_PREFIX, self.resource_list_notes)
 
 
-	@mcp_tool(
-		name="create_or_update_note",
-		title="Create or update a note",
-		description="""
-			Create a new Markdown note or update an existing Markdown note at the given path with the provided content.
-			
-			The path parameter specifies the note location:
-			- Can include subdirectories separated by '/' (e.g., "projects/meeting-notes")
-			- The '.md' extension is automatically appended if not provided
-			- Leading slashes are normalized
-			- Subdirectories are automatically created if they don't exist
-			- Paths containing '..' are not allowed for security reasons
-			
-			The content parameter should contain valid Markdown text.
-			
-			Returns a resource link that can be used to reference the created or updated note.
-		""",
-		inputSchema={
-			"type": "object",
-			"properties": {
-				"path": {"type": "string"},
-				"content": {"type": "string", "format": "markdown"},
-			},
-		},
-	)
-	async def tool_create_or_update_note(self, path, content):
-
+	def _prepare_note_path(self, path):
+		'''
+		Normalize a user-supplied note path: strip leading slashes, append
+		the note extension if missing and resolve the path within the notes
+		directory. Returns a `(path, note_path)` tuple of the cleaned
+		relative path and the absolute filesystem path.
+		Raises ValueError when the path escapes the notes directory.
+		'''
+		path = path.lstrip('/')
 		if not path.endswith(NOTE_EXTENSION):
 			path += NOTE_EXTENSION
 
-		note_path = _normalize_path(self.NotesDirectory, path)
+		note_path = self._normalize_path(path)
 		if note_path is None:
 			raise ValueError("Path is not within the notes directory")
 
-		os.makedirs(os.path.dirname(note_path), exist_ok=True)
+		return path, note_path
+
+
+	def _normalize_path(self, user_path):
+		'''
+		Normalize the user-supplied path to be within the notes directory.
+		Returns the absolute path, or None when the path escapes.
+
+		The prefix test on the normalized path is the primary containment
+		check; when the parent directory is not one this handler created
+		or saw at startup, the path is additionally resolved with
+		os.path.realpath and re-checked. Note the deliberate limitation:
+		a symlink sitting directly in a trusted parent takes the fast
+		path and is followed wherever it points — trusted parents are
+		trusted as a whole.
+		'''
+		user_path = user_path.lstrip('/')
+		if _SEG_TRAVERSAL.search(user_path) is not None:
+			# Fast-fail on an explicit traversal segment
+			return None
+
+		abs_user = os.path.abspath(os.path.join(self.NotesDirectory, user_path))
+		if abs_user != self.NotesDirectory and not abs_user.startswith(self._NotesPrefix):
+			return None
+
+		if os.path.dirname(abs_user) not in self._KnownDirs:
+			real_user = os.path.realpath(abs_user)
+			if real_user != self.NotesDirectory and not real_user.startswith(self._NotesPrefix):
+				return None
+
+		return abs_user
+
+
+	def _ensure_dir(self, directory):
+		'''
+		Create the directory unless it is already known to exist;
+		repeat writes into the same place skip the makedirs syscall.
+		'''
+		if directory not in self._KnownDirs:
+			os.makedirs(directory, exist_ok=True)
+			self._KnownDirs.add(directory)
+
+
+	async def _write_file(self, path, content):
+		'''
+		Write a file durably, creating its parent directory as needed.
+		The write ends with an fsync that can take milliseconds or more
+		under load, so it is always dispatched to a worker thread.
+
+		A FileNotFoundError from the write means the parent directory was
+		removed out-of-band while still listed in the known-directories
+		cache; the stale entry is dropped, the directory recreated and
+		the write retried once.
+		'''
+		directory = os.path.dirname(path)
+		self._ensure_dir(directory)
+		try:
+			await asyncio.to_thread(_write_file_sync, path, content)
+		except FileNotFoundError:
+			self._KnownDirs.discard(directory)
+			self._ensure_dir(directory)
+			await asyncio.to_thread(_write_file_sync, path, content)
+
+
+	@mcp_tool(
+		name="create_or_update_note",
+		title="Create or update a note",
+		description=_DESC_CREATE_OR_UPDATE_NOTE,
+		inputSchema=_SCHEMA_NOTE_WRITE,
+	)
+	async def tool_create_or_update_note(self, path, content):
+
+		path, note_path = self._prepare_note_path(path)
 
 		new_note = not os.path.isfile(note_path)
-		with open(note_path, "w") as f:
-			f.write(content)
+		await self._write_file(note_path, content)
 
-		if new_note:
-			L.log(asab.LOG_NOTICE, "Created a new Markdown note", struct_data={"path": path})
-		else:
-			L.log(asab.LOG_NOTICE, "Updated a Markdown note", struct_data={"path": path})
+		# This handler owns every write path, so drop the cached listing
+		# and any stale content for this note right away.
+		self._ListCache = None
+		self._NoteCache.pop(note_path, None)
+
+		if L.isEnabledFor(asab.LOG_NOTICE):
+			if new_note:
+				L.log(asab.LOG_NOTICE, "Created a new Markdown note", struct_data={"path": path})
+			else:
+				L.log(asab.LOG_NOTICE, "Updated a Markdown note", struct_data={"path": path})
 
 		return MCPToolResultResourceLink(
 			uri=f"{NOTE_URI_PREFIX}/{path}",
@@ -92,41 +318,24 @@ class MarkdownNotesMCPHandler():
 	@mcp_tool(
 		name="delete_note",
 		title="Delete a note",
-		description="""
-			Delete a Markdown note at the specified path.
-			
-			The path parameter:
-			- Can include subdirectories separated by '/' (e.g., "projects/old-note")
-			- The '.md' extension is automatically appended if not provided
-			- Leading slashes are normalized
-			- Paths containing '..' are not allowed for security reasons
-			
-			Note: Only the note file is deleted. Empty subdirectories are left intact.
-			If the note does not exist, an error will be raised.
-			
-			Returns a confirmation message indicating successful deletion.
-		""",
-		inputSchema={
-			"type": "object",
-			"properties": {
-				"path": {"type": "string"},
-			},
-		},
+		description=_DESC_DELETE_NOTE,
+		inputSchema=_SCHEMA_PATH,
 	)
 	async def tool_delete_note(self, path):
-		if not path.endswith(NOTE_EXTENSION):
-			path += NOTE_EXTENSION
-
-		note_path = _normalize_path(self.NotesDirectory, path)
-		if note_path is None:
-			raise ValueError("Path is not within the notes directory")
+		path, note_path = self._prepare_note_path(path)
 
-		if not os.path.isfile(note_path):
+		try:
+			os.remove(note_path)
+		except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+			# Missing note, a directory posing as one, or a file
+			# component in the middle of the path
 			raise ValueError(f"Note '{path}' does not exist. Use 'list_notes' to see available notes.")
 
-		os.remove(note_path)
+		self._ListCache = None
+		self._NoteCache.pop(note_path, None)
 
-		L.log(asab.LOG_NOTICE, "Deleted a Markdown note", struct_data={"path": path})
+		if L.isEnabledFor(asab.LOG_NOTICE):
+			L.log(asab.LOG_NOTICE, "Deleted a Markdown note", struct_data={"path": path})
 
 		return f"Successfully deleted note: {path}"
 
@@ -134,176 +343,120 @@ class MarkdownNotesMCPHandler():
 	@mcp_tool(
 		name="list_notes",
 		title="List notes in a directory, optionally including directories",
-		description="""
-			List all Markdown notes (.md files) in the specified directory, optionally including directories.
-			
-			The directory parameter:
-			- Use an empty string or '/' to list notes in the root notes directory
-			- Can include subdirectories separated by '/' (e.g., "projects/2024")
-			- Leading slashes are normalized
-			- Paths containing '..' are not allowed for security reasons
-			- Only lists direct children (does not recursively search subdirectories)
-			- Hidden files (starting with '.') are excluded
-
-			The directories parameter:
-			- If True, the list will include directories, can be used to list directories recursively
-			- If False, the list will only include notes
-			- If not provided, the list will only include notes
-			
-			Returns:
-			- A text summary listing all notes found in the directory
-			- Resource links for each note that can be used with 'read_note' or other tools
-			- The resource link URI or name field can be used as the path parameter in other operations
-			
-			If the directory is empty or doesn't exist, an appropriate message will be returned.
-		""",
-		inputSchema={
-			"type": "object",
-			"properties": {
-				"directory": {"type": "string", "default": ""},
-				"directories": {"type": "boolean", "default": False},
-			},
-		},
+		description=_DESC_LIST_NOTES,
+		inputSchema=_SCHEMA_LIST_NOTES,
 	)
 	async def tool_list_notes(self, directory='', directories=False):
 
-		directory_path = _normalize_path(self.NotesDirectory, directory)
+		directory_path = self._normalize_path(directory)
 		if directory_path is None:
 			raise ValueError("Path is not within the notes directory")
 
 		if not os.path.isdir(directory_path):
 			raise ValueError(f"Directory '{directory}' does not exist. Use an empty string to list the root directory.")
 
-		notes = list(note for note in os.listdir(directory_path) if note.endswith(NOTE_EXTENSION) and not note.startswith('.'))
+		notes = []
+		dirlist = []
+		with os.scandir(directory_path) as it:
+			for entry in it:
+				if entry.name.startswith('.'):
+					continue
+				if entry.is_dir(follow_symlinks=False):
+					dirlist.append(entry.name)
+				elif entry.name.endswith(NOTE_EXTENSION):
+					notes.append(entry.name)
+
+		notes.sort()
 
 		if directory == "":
 			dir_display = "root directory"
 		else:
 			dir_display = f"directory '{directory}'"
-		
+
+		if len(notes) == 0 and not directories:
+			# Nothing to list and no directory section requested;
+			# skip the prefix computation and link building entirely
+			return [MCPToolResultTextContent(text=f"No Markdown notes found in {dir_display}.\n")]
+
 		if len(notes) == 0:
 			summary = f"No Markdown notes found in {dir_display}.\n"
 		else:
-			summary = f"Found {len(notes)} note{'s' if len(notes) != 1 else ''} in {dir_display}:\n\n"
-			for note in sorted(notes):
-				summary += f" * `{note}`\n"
+			parts = [f"Found {len(notes)} note{'s' if len(notes) != 1 else ''} in {dir_display}:\n"]
+			parts.extend(f" * `{note}`" for note in notes)
+			summary = "\n".join(parts) + "\n"
 
 		if directories:
-			dirlist = list(dir for dir in os.listdir(directory_path) if os.path.isdir(os.path.join(directory_path, dir)) and not dir.startswith('.'))
-			summary += f"\nFound {len(dirlist)} director{'ies' if len(dirlist) != 1 else 'y'} in {dir_display}:\n\n"
-			for directory in sorted(dirlist):
-				summary += f" * `{directory}`\n"
+			parts = [f"\nFound {len(dirlist)} director{'ies' if len(dirlist) != 1 else 'y'} in {dir_display}:\n"]
+			parts.extend(f" * `{d}`" for d in sorted(dirlist))
+			summary += "\n".join(parts) + "\n"
 
 		# Build URIs correctly, handling empty directory case
 		if directory:
-			uri_prefix = f"{NOTE_URI_PREFIX}/{directory}"
-			name_prefix = f"{directory}/"
+			uri_prefix = NOTE_URI_PREFIX + "/" + directory + "/"
+			name_prefix = directory + "/"
 		else:
-			uri_prefix = NOTE_URI_PREFIX
+			uri_prefix = NOTE_URI_PREFIX + "/"
 			name_prefix = ""
-		
-		return [
-			MCPToolResultTextContent(text=summary)
-		] + [
-			MCPToolResultResourceLink(
-				uri=f"{uri_prefix}/{note}",
-				name=f"{name_prefix}{note}",
-				description=f"Markdown note: {name_prefix}{note}",
+
+		results = [MCPToolResultTextContent(text=summary)]
+		for note in notes:
+			name = name_prefix + note
+			results.append(MCPToolResultResourceLink(
+				uri=uri_prefix + note,
+				name=name,
+				description=_NOTE_DESC_PREFIX + name,
 				mimeType=NOTE_MIME_TYPE,
-			) for note in sorted(notes)
- 		]
+			))
+		return results
 
 
 	@mcp_tool(
 		name="read_note",
 		title="Read a note",
-		description="""
-			Read and return the full content of a Markdown note at the specified path.
-			
-			The path parameter:
-			- Can include subdirectories separated by '/' (e.g., "projects/meeting-notes")
-			- The '.md' extension is automatically appended if not provided
-			- Leading slashes are normalized
-			- Paths containing '..' are not allowed for security reasons
-			
-			Returns the raw Markdown content of the note as a string.
-			If the note does not exist, an error will be raised with a suggestion to use 'list_notes' to find available notes.
-		""",
-		inputSchema={
-			"type": "object",
-			"properties": {
-				"path": {"type": "string"},
-			},
-		},
+		description=_DESC_READ_NOTE,
+		inputSchema=_SCHEMA_PATH,
 	)
 	async def tool_read_note(self, path):
-		if not path.endswith(NOTE_EXTENSION):
-			path += NOTE_EXTENSION
-
-		note_path = _normalize_path(self.NotesDirectory, path)
-		if note_path is None:
-			raise ValueError("Path is not within the notes directory")
+		path, note_path = self._prepare_note_path(path)
 
-		if not os.path.isfile(note_path):
+		try:
+			content = await asyncio.to_thread(_read_file_sync, note_path)
+		except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
 			raise ValueError(f"Note '{path}' does not exist. Use 'list_notes' to see available notes.")
 
-		with open(note_path, "r") as f:
-			content = f.read()
-
 		return content
 
 
 	@mcp_tool(
 		name="upload_picture",
 		title="Upload a picture",
-		description=f"""
-			Upload an image file to the notes directory.
-			
-			The path parameter:
-			- Must include a filename with one of the supported extensions: {', '.join(sorted(PICTURE_EXTENSIONS))}
-			- Can include subdirectories separated by '/' (e.g., "images/screenshots/example.png")
-			- Subdirectories are automatically created if they don't exist
-			- Leading slashes are normalized
-			- Paths containing '..' are not allowed for security reasons
-			
-			The content parameter should contain the binary image data (base64-encoded when transmitted).
-			
-			Supported image formats: {', '.join(sorted(PICTURE_EXTENSIONS))}
-			
-			Returns a resource link that can be used to reference the uploaded image.
-		""",
-		inputSchema={
-			"type": "object",
-			"properties": {
-				"path": {"type": "string"},
-				"content": {"type": "string", "format": "binary"},
-			},
-		},
+		description=_DESC_UPLOAD_PICTURE,
+		inputSchema=_SCHEMA_PICTURE_UPLOAD,
 	)
 	async def tool_upload_picture(self, path, content):
 
-		path = _normalize_path(self.NotesDirectory, path)
+		path = self._normalize_path(path)
 		if path is None:
 			raise ValueError("Path is not within the notes directory")
 
-		if not any(path.endswith(ext) for ext in PICTURE_EXTENSIONS):
+		if not path.endswith(_PICTURE_EXT_TUPLE):
 			extensions_list = ', '.join(sorted(PICTURE_EXTENSIONS))
 			raise ValueError(f"Unsupported picture extension. The path must end with one of: {extensions_list}")
 
-		os.makedirs(os.path.dirname(path), exist_ok=True)
-		with open(path, "wb") as f:
-			f.write(content)
-
-		# Determine MIME type based on extension
-		mime_type = None
-		if path.endswith(".png"):
-			mime_type = "image/png"
-		elif path.endswith(".jpg"):
-			mime_type = "image/jpeg"
-		elif path.endswith(".gif"):
-			mime_type = "image/gif"
-		assert mime_type is not None, f"Unsupported picture extension: {path}"
-		
+		if isinstance(content, str):
+			# The binary payload arrives base64-encoded over JSON-RPC;
+			# decode once and write the raw bytes without a text codec pass.
+			content = base64.b64decode(content)
+
+		await self._write_file(path, memoryview(content))
+
+		self._ListCache = None
+
+		# Determine the MIME type from the suffix that passed the extension
+		# gate above; os.path.splitext would report no extension for a
+		# bare-extension basename such as '.png'.
+		mime_type = next(m for ext, m in _MIME_BY_EXT.items() if path.endswith(ext))
+
 		return MCPToolResultResourceLink(
 			uri=f"{PICTURE_URI_PREFIX}/{path}",
 			name=path,
@@ -327,21 +480,29 @@ class MarkdownNotesMCPHandler():
 		'''
 
 		assert uri.startswith(NOTE_URI_PREFIX)
-		note_path = uri[len(NOTE_URI_PREFIX):]
+		_, note_path = self._prepare_note_path(uri[len(NOTE_URI_PREFIX):])
 
-		if not note_path.endswith(NOTE_EXTENSION):
-			note_path += NOTE_EXTENSION
-
-		note_path = _normalize_path(self.NotesDirectory, note_path)
-		if note_path is None:
-			raise ValueError("Path is not within the notes directory")
-
-		if not os.path.isfile(note_path):
+		try:
+			st = os.stat(note_path)
+		except (FileNotFoundError, NotADirectoryError):
 			L.warning("Note not found", struct_data={"uri": uri})
 			return None
 
-		with open(note_path, "r") as f:
-			content = f.read()
+		cached = self._NoteCache.get(note_path)
+		if cached is not None and cached[0] == st.st_mtime and cached[1] == st.st_size:
+			content = cached[2]
+		else:
+			try:
+				content = await asyncio.to_thread(_read_file_sync, note_path)
+			except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+				# The stat can succeed on a directory named like a note,
+				# or the file can vanish between the stat and the read
+				L.warning("Note not found", struct_data={"uri": uri})
+				return None
+			if len(self._NoteCache) >= NOTE_CACHE_MAX_SIZE:
+				# Evict the oldest entry to keep the cache bounded
+				del self._NoteCache[next(iter(self._NoteCache))]
+			self._NoteCache[note_path] = (st.st_mtime, st.st_size, content)
 
 		return {
 			"uri": uri,
@@ -351,37 +512,90 @@ class MarkdownNotesMCPHandler():
 
 
 	async def resource_list_notes(self):
+		st = os.stat(self.NotesDirectory)
+		now = time.monotonic()
+		if self._ListCache is not None and (now - self._ListCacheTs) < LIST_CACHE_TTL and st.st_mtime == self._ListCacheMtime:
+			for resource in self._ListCache:
+				yield resource
+			return
+
 		resources = []
-		for root, dirs, files in os.walk(self.NotesDirectory):
-			for file in files:
-				if file.endswith(NOTE_EXTENSION):
-					path = root[len(self.NotesDirectory):]
-					# Handle root directory case (empty path)
-					if path:
-						uri = f"{NOTE_URI_PREFIX}/{path}/{file}"
-						name = f"{path}/{file[:-len(NOTE_EXTENSION)]}"
-					else:
-						uri = f"{NOTE_URI_PREFIX}/{file}"
-						name = file[:-len(NOTE_EXTENSION)]
-					
-					resources.append(MCPToolResultResourceLink(
-						uri=uri,
+		prefix_len = len(self._NotesPrefix)
+		ext_len = len(NOTE_EXTENSION)
+		stack = collections.deque([self.NotesDirectory])
+		while stack:
+			directory = stack.pop()
+
+			# Precompute the URI/name prefixes once per directory,
+			# handling the root directory case (empty relative path)
+			rel = directory[prefix_len:]
+			if rel:
+				uri_prefix = NOTE_URI_PREFIX + "/" + rel + "/"
+				name_prefix = rel + "/"
+			else:
+				uri_prefix = NOTE_URI_PREFIX + "/"
+				name_prefix = ""
+
+			with os.scandir(directory) as it:
+				for entry in it:
+					if entry.name.startswith('.'):
+						# Prune hidden files and whole hidden subtrees
+						continue
+					if entry.is_dir(follow_symlinks=False):
+						stack.append(entry.path)
+						continue
+					if not entry.name.endswith(NOTE_EXTENSION) or not entry.is_file(follow_symlinks=False):
+						continue
+
+					name = name_prefix + entry.name[:-ext_len]
+					resource = MCPToolResultResourceLink(
+						uri=uri_prefix + entry.name,
 						name=name,
-						description=f"Markdown note: {name}",
+						description=_NOTE_DESC_PREFIX + name,
 						mimeType=NOTE_MIME_TYPE,
-					))
-		return resources
+					)
+					resources.append(resource)
+					yield resource
+
+		self._ListCache = resources
+		self._ListCacheTs = now
+		self._ListCacheMtime = st.st_mtime
 
 
-def _normalize_path(base_path, user_path):
+def _read_file_sync(path):
 	'''
-	Normalize the path to be within the base path.
+	Blocking file read, meant to be dispatched to a worker thread
+	via `asyncio.to_thread` so that the event loop stays responsive.
+
+	The file is read in binary mode and decoded in one pass, skipping
+	the incremental decoder that a text-mode file object drags in.
 	'''
-	while user_path.startswith('/'):
-		user_path = user_path[1:]
-	abs_base = os.path.abspath(base_path)
-	abs_user = os.path.abspath(os.path.join(base_path, user_path))
-	if os.path.commonpath([abs_base, abs_user]) == abs_base:
-		return abs_user
-	else:
-		return None
+	with open(path, "rb") as f:
+		return f.read().decode("utf-8")
+
+
+def _write_file_sync(path, content):
+	'''
+	Blocking file write as a single unit of work for `asyncio.to_thread`.
+	The parent directory must already exist; callers go through
+	`_write_file`, which creates it and retries once when it has
+	vanished out-of-band.
+
+	The file is written with `os.write` + `os.fsync` so the content is
+	durable on disk when the tool reports success; a buffered `open`
+	would only flush to the page cache and a crash could lose the file.
+	'''
+	if isinstance(content, str):
+		content = content.encode("utf-8")
+	view = memoryview(content)
+	fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+	try:
+		# Write in bounded chunks (os.write may also return a short
+		# count) so a multi-megabyte picture is never handed to the
+		# kernel as one giant buffer.
+		offset = 0
+		while offset < len(view):
+			offset += os.write(fd, view[offset:offset + WRITE_CHUNK_SIZE])
+		os.fsync(fd)
+	finally:
+		os.close(fd)
@@ -180,23 +180,22 @@ class MCPService(asab.Service):
 
 		https://modelcontextprotocol.io/specification/2025-06-18/server/resources#listing-resources
 		'''
-		resources = []
+		transformed_resources = []
 
 		for _, resource_list_function in self.ResourceLists.items():
-			resources.extend(await resource_list_function())
-
-		transformed_resources = []
-		for resource in resources:
-			if isinstance(resource, MCPToolResultResourceLink):
-				transformed_resources.append(prune_nulls({
-					"uri": resource.uri,
-					"name": resource.name,
-					"title": resource.title,
-					"description": resource.description,
-					"mimeType": resource.mimeType,
-				}))
-			else:
-				raise ValueError(f"Unsupported resource type: {type(resource)}")
+			# The resource list function is an async generator, so resources
+			# are transformed as they arrive instead of being materialized first.
+			async for resource in resource_list_function():
+				if isinstance(resource, MCPToolResultResourceLink):
+					transformed_resources.append(prune_nulls({
+						"uri": resource.uri,
+						"name": resource.name,
+						"title": resource.title,
+						"description": resource.description,
+						"mimeType": resource.mimeType,
+					}))
+				else:
+					raise ValueError(f"Unsupported resource type: {type(resource)}")
 
 		return {
 			"resources": transformed_resources,